@@ -3,7 +3,9 @@ import math
 import json
 import os
 import random
-from collections import deque
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
 
 # =========================
 # 2D PLATFORMER (pygame only)
@@ -71,6 +73,20 @@ COL_FLAG = (255, 130, 180)
 COL_PLAYER = (255, 190, 40)
 COL_DASHITEM = (130, 255, 220)
 COL_ENEMY = (205, 125, 95)
+COL_DUST = (210, 215, 230)
+TEXT_CACHE_CAP = 64  # gerenderte UI-Texte (font, text, farbe) -> Surface
+
+# --- Partikel-Sprites (vorgerendert: Farbe x Größe x Alpha-Stufe) ---
+PARTICLE_COLORS = (COL_DUST, COL_GATE, COL_COIN, COL_DASHITEM, COL_ENEMY)
+P_DUST, P_GATE, P_COIN, P_DASH, P_ENEMY = range(len(PARTICLE_COLORS))
+PARTICLE_MAX_SIZE = 6
+PARTICLE_ALPHA_STEPS = 8
+PARTICLE_CAP = 2048
+PARTICLE_CULL_MARGIN = 64
+
+# Einheitskreis-Tabelle für Partikel-Bursts (Index = random.getrandbits(8))
+COS_TBL = tuple(math.cos(i * math.tau / 256) for i in range(256))
+SIN_TBL = tuple(math.sin(i * math.tau / 256) for i in range(256))
 
 # --- Enemies ---
 ENEMY_SPEED = 90.0
@@ -93,19 +109,33 @@ FIRST_PLATFORM_IS_LOW = True  # 1 Tile Luft -> nur geduckt passierbar
 def clamp(v, a, b):
     return a if v < a else b if v > b else v
 
+# zuletzt gelesener Spielstand je (mtime_ns, Größe) der Datei; unverändert -> kein erneutes Parsen
+_SAVE_CACHE = {}
+
 def load_save():
-    if os.path.exists(SAVE_FILE):
+    try:
+        st = os.stat(SAVE_FILE)
+    except OSError:
+        return {"best_time": None}
+    key = (st.st_mtime_ns, st.st_size)
+    data = _SAVE_CACHE.get(key)
+    if data is None:
         try:
             with open(SAVE_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+                data = json.load(f)
         except:
-            pass
-    return {"best_time": None}
+            return {"best_time": None}
+        _SAVE_CACHE.clear(); _SAVE_CACHE[key] = data
+    return dict(data)  # Aufrufer dürfen die Kopie verändern und speichern
 
 def save_save(data):
+    # in einem Stück in eine Temp-Datei schreiben und dann ersetzen: kein halber Spielstand bei Absturz
+    tmp = SAVE_FILE + ".tmp"
     try:
-        with open(SAVE_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        payload = json.dumps(data)
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp, SAVE_FILE)
     except:
         pass
 
@@ -176,43 +206,256 @@ def make_level():
     return [''.join(row) for row in grid]
 
 LEVEL = make_level()
+TILEMAP_H = len(LEVEL)
+TILEMAP_W = len(LEVEL[0])
+LEVEL_PX_W, LEVEL_PX_H = TILEMAP_W*TILE, TILEMAP_H*TILE
+# flache Tilemap: Index = ty*TILEMAP_W + tx, Werte sind Byte-Codes
+LEVEL_BYTES = "".join(LEVEL).encode("ascii")
+
+CH_SPACE, CH_X, CH_EQ, CH_PIPE, CH_SPIKE, CH_C, CH_D, CH_F, CH_G = (ord(c) for c in " X=|^CDFG")
+
+# Tile-Flags: TILE_FLAGS[byte] & MASKE statt Set-/Tupel-Tests pro Tile
+SOLID_BIT, GATE_BIT, SPIKE_BIT, FLAG_BIT, PICKUP_BIT = 1, 2, 4, 8, 16
+TILE_FLAGS = bytearray(256)
+TILE_FLAGS[CH_X] = SOLID_BIT
+TILE_FLAGS[CH_EQ] = SOLID_BIT
+TILE_FLAGS[CH_PIPE] = GATE_BIT
+TILE_FLAGS[CH_SPIKE] = SPIKE_BIT
+TILE_FLAGS[CH_F] = FLAG_BIT
+TILE_FLAGS[CH_C] = PICKUP_BIT
+TILE_FLAGS[CH_D] = PICKUP_BIT
+
+BLOCK_MASK = SOLID_BIT | GATE_BIT | SPIKE_BIT | FLAG_BIT   # Spieler: Aufstehen/Platz prüfen
+ENEMY_BLOCK_MASK = SOLID_BIT | GATE_BIT | FLAG_BIT
+MOVE_BLOCK_MASK = SOLID_BIT | GATE_BIT                     # Spieler-Bewegung ohne Dash
+STATIC_MASK = SOLID_BIT | SPIKE_BIT | FLAG_BIT             # ändert sich nie -> vorgerendert
+TOUCH_MASK = PICKUP_BIT | SPIKE_BIT | FLAG_BIT             # Kontakt-Tiles für Game.update
+DYNAMIC_MASK = GATE_BIT | PICKUP_BIT                       # veränderlich -> Game.clear_tile
+
+# Kontakt-Tiles spaltenweise sortiert (Schlüssel tx*TILEMAP_H+ty) für die bisect-Suche in
+# Game.update; eingesammelte Tiles bleiben drin und werden über die Tilemap übersprungen
+TOUCH_KEYS = tuple(sorted((i % TILEMAP_W)*TILEMAP_H + i // TILEMAP_W
+                          for i, ch in enumerate(LEVEL_BYTES) if TILE_FLAGS[ch] & TOUCH_MASK))
 
 # ------------- World helpers -------------
-def tiles_in_aabb(tilemap, rect):
-    min_tx = max(0, rect.left // TILE)
-    max_tx = min(len(tilemap[0]) - 1, rect.right // TILE)
-    min_ty = max(0, rect.top // TILE)
-    max_ty = min(len(tilemap) - 1, rect.bottom // TILE)
-    for ty in range(min_ty, max_ty + 1):
-        row = tilemap[ty]
-        for tx in range(min_tx, max_tx + 1):
-            ch = row[tx]
-            if ch != ' ':
-                yield tx, ty, ch
-
-def solid(ch): return ch in ('X', '=')
+# Kollisions-Sweeps: reine Zahlen-Funktionen auf der flachen Tilemap (keine Rects).
+# Level-Konstanten werden beim Laden als Default-Argumente eingebacken
+# (Spezialisierung auf die feste Tilemap, Zugriff per LOAD_FAST)
+def _sweep_h(x, y, vx, w, h, dt, dashing, tiles, *, _tile=TILE, _w=TILEMAP_W, _map_h=TILEMAP_H,
+             _flags=TILE_FLAGS, _pipe=CH_PIPE, _solid=SOLID_BIT):
+    """Horizontal bewegen und an soliden Tiles/Gates stoppen. Spalten werden in
+    Bewegungsrichtung geprüft, die erste blockierende Spalte stoppt.
+    Gibt (x, vx, gate_tx, gate_ty) zurück; gate = -1 wenn kein Gate im Dash getroffen."""
+    x += vx * dt
+    left = int(x - w/2); top = int(y - h)
+    right = left + w; bottom = top + h
+    gate_tx = gate_ty = -1
+    min_tx = max(0, (left - 1) // _tile); max_tx = min(_w - 1, (right + 1) // _tile)
+    # alle Reihen in [top+1, bottom-1] überlappen vertikal -> nur Spalten-Test nötig
+    rows = range(max(0, (top + 1) // _tile), min(_map_h - 1, (bottom - 1) // _tile) + 1)
+    cols = range(max_tx, min_tx - 1, -1) if vx < 0 else range(min_tx, max_tx + 1)
+    for tx in cols:
+        tl = tx * _tile
+        inside = left < tl + _tile and tl < right
+        if not (inside or dashing):
+            continue  # Randspalte zählt nur für Gates im Dash
+        for ty in rows:
+            ch = tiles[ty * _w + tx]
+            if ch == _pipe:
+                if dashing:
+                    gate_tx, gate_ty = tx, ty
+                    continue
+            elif not _flags[ch] & _solid:
+                continue
+            if inside:
+                if vx > 0: x = tl - w/2
+                elif vx < 0: x = tl + _tile + w/2
+                vx = 0
+                if not dashing:
+                    return x, vx, gate_tx, gate_ty
+    return x, vx, gate_tx, gate_ty
+
+def _sweep_v(x, y, vy, w, h, dt, inset, blocking, tiles, *, _tile=TILE, _w=TILEMAP_W, _map_h=TILEMAP_H,
+             _flags=TILE_FLAGS):
+    """Vertikal in einem Schritt bewegen: die überquerten Tile-Reihen in
+    Bewegungsrichtung prüfen und an der ersten blockierenden einrasten.
+    Gibt (y, vy, landed) zurück."""
+    dy = vy * dt
+    if dy == 0:
+        return y, vy, False
+    left = int(x - w/2); right = left + w
+    min_tx = max(0, (left + inset) // _tile); max_tx = min(_w - 1, (right - inset) // _tile)
+    prev_top = int(y - h); prev_bottom = prev_top + h
+    y += dy
+    top = int(y - h); bottom = top + h
+    if dy > 0:
+        # Boden: Reihen mit prev_bottom <= Tile-Oberkante < bottom
+        first = max(0, -(-prev_bottom // _tile)); last = min(_map_h - 1, (bottom - 1) // _tile)
+        for ty in range(first, last + 1):
+            base = ty * _w
+            for tx in range(min_tx, max_tx + 1):
+                if _flags[tiles[base + tx]] & blocking:
+                    return ty * _tile, 0, True
+    else:
+        # Decke: Reihen mit top < Tile-Unterkante <= prev_top
+        first = min(_map_h - 1, prev_top // _tile - 1); last = max(0, top // _tile)
+        for ty in range(first, last - 1, -1):
+            base = ty * _w
+            for tx in range(min_tx, max_tx + 1):
+                if _flags[tiles[base + tx]] & blocking:
+                    return (ty + 1) * _tile + h, 0, False
+    return y, vy, False
+
+class SpatialHashGrid:
+    """Grobes Raster (Zellgröße ~2x Objektgröße) für die Broadphase.
+    Wird pro Frame geleert und neu befüllt; die Zell-Listen bleiben erhalten."""
+    def __init__(self, cell=2*TILE):
+        self.cell = cell
+        self.cells = defaultdict(list)
+
+    def clear(self):
+        for lst in self.cells.values():
+            lst.clear()
+
+    def _span(self, rect):
+        c = self.cell
+        return (range(rect.left // c, rect.right // c + 1),
+                range(rect.top // c, rect.bottom // c + 1))
+
+    def insert(self, rect, item):
+        cells = self.cells
+        xs, ys = self._span(rect)
+        for cy in ys:
+            for cx in xs:
+                cells[(cx, cy)].append(item)
+
+    def query(self, rect):
+        cells = self.cells
+        found = []
+        seen = set()
+        xs, ys = self._span(rect)
+        for cy in ys:
+            for cx in xs:
+                lst = cells.get((cx, cy))
+                if not lst: continue
+                for item in lst:
+                    key = id(item)
+                    if key not in seen:
+                        seen.add(key); found.append(item)
+        return found
 
 # ------------- Entities -------------
-class Particle:
-    def __init__(self, x, y, vx, vy, life, color, size):
-        self.x, self.y = x, y
-        self.vx, self.vy = vx, vy
-        self.life = life
-        self.total = life
-        self.color = color
-        self.size = size
-    def update(self, dt):
-        self.x += self.vx*dt; self.y += self.vy*dt
-        self.vy += 1800*dt
-        self.life -= dt
-        return self.life > 0
+# Eingabe eines Frames; Flanken (pressed/released) berechnet Game.update
+InputState = namedtuple("InputState",
+    "left right shift_held dash_pressed jump_pressed jump_released crouch_held crouch_pressed")
+
+class ParticleSystem:
+    """Alle Partikel als parallele Listen (SoA) statt einzelner Objekte.
+    Die Listen sind auf `cap` Slots vorbelegt; gültig sind die ersten `n`.
+    update() integriert und kompaktiert in einem Durchlauf."""
+    def __init__(self, cap=PARTICLE_CAP):
+        self.cap = cap
+        self.n = 0
+        self.x, self.y = [0.0]*cap, [0.0]*cap
+        self.vx, self.vy = [0.0]*cap, [0.0]*cap
+        self.life, self.total = [0.0]*cap, [0.0]*cap
+        self.color = [0]*cap  # Index in PARTICLE_COLORS
+        self.size = [0]*cap
+
+    def spawn(self, x, y, vx, vy, life, color, size):
+        i = self.n
+        if i >= self.cap: return  # Pool voll -> Partikel verwerfen
+        self.x[i] = x; self.y[i] = y
+        self.vx[i] = vx; self.vy[i] = vy
+        self.life[i] = life; self.total[i] = life
+        self.color[i] = color; self.size[i] = size
+        self.n = i + 1
+
+    def spawn_burst(self, x, y, n, spd_lo, spd_hi, life, color, size, vy_bias=0.0):
+        """n Partikel radial um (x, y), Richtung aus COS_TBL/SIN_TBL."""
+        start = self.n
+        end = min(self.cap, start + n)
+        rbits, uniform = random.getrandbits, random.uniform
+        cos_t, sin_t = COS_TBL, SIN_TBL
+        xs, ys, vxs, vys = self.x, self.y, self.vx, self.vy
+        for i in range(start, end):
+            k = rbits(8); spd = uniform(spd_lo, spd_hi)
+            xs[i] = x; ys[i] = y
+            vxs[i] = cos_t[k]*spd; vys[i] = sin_t[k]*spd + vy_bias
+        k = end - start
+        self.life[start:end] = [life]*k; self.total[start:end] = [life]*k
+        self.color[start:end] = [color]*k; self.size[start:end] = [size]*k
+        self.n = end
+
+    def spawn_spray(self, x, y, n, vx_lo, vx_hi, vy_lo, vy_hi, life, color, size):
+        """n Partikel aus (x, y) mit vx/vy gleichverteilt in den Intervallen (gerichteter Staub)."""
+        start = self.n
+        end = min(self.cap, start + n)
+        uniform = random.uniform
+        xs, ys, vxs, vys = self.x, self.y, self.vx, self.vy
+        for i in range(start, end):
+            xs[i] = x; ys[i] = y
+            vxs[i] = uniform(vx_lo, vx_hi); vys[i] = uniform(vy_lo, vy_hi)
+        k = end - start
+        self.life[start:end] = [life]*k; self.total[start:end] = [life]*k
+        self.color[start:end] = [color]*k; self.size[start:end] = [size]*k
+        self.n = end
+
+    def update(self, dt, camy=0.0):
+        xs, ys, vxs, vys = self.x, self.y, self.vx, self.vy
+        lifes, totals, colors, sizes = self.life, self.total, self.color, self.size
+        g = 1800*dt
+        # unter dem Bildschirm und fallend -> nie wieder sichtbar
+        y_gone = camy + HEIGHT + PARTICLE_CULL_MARGIN
+        w = 0
+        for i in range(self.n):
+            life = lifes[i] - dt
+            if life <= 0: continue
+            vx, vy = vxs[i], vys[i]
+            if vy >= 0 and ys[i] > y_gone: continue
+            xs[w] = xs[i] + vx*dt; ys[w] = ys[i] + vy*dt
+            vxs[w] = vx; vys[w] = vy + g
+            lifes[w] = life; totals[w] = totals[i]
+            colors[w] = colors[i]; sizes[w] = sizes[i]
+            w += 1
+        self.n = w
+
     def draw(self, surf, camx, camy):
-        t = clamp(self.life/self.total, 0, 1)
-        s = max(1, int(self.size*t))
-        a = int(255*t)
-        srf = pygame.Surface((s, s), pygame.SRCALPHA)
-        pygame.draw.circle(srf, (*self.color, a), (s//2, s//2), s//2)
-        surf.blit(srf, (self.x - camx - s//2, self.y - camy - s//2))
+        sprites = PARTICLE_SPRITES
+        steps = PARTICLE_ALPHA_STEPS
+        batch = []
+        xs, ys, lifes, totals, colors, sizes = self.x, self.y, self.life, self.total, self.color, self.size
+        m = PARTICLE_MAX_SIZE
+        x_lo, x_hi = camx - m, camx + WIDTH + m
+        y_lo, y_hi = camy - m, camy + HEIGHT + m
+        for i in range(self.n):
+            x, y = xs[i], ys[i]
+            if x < x_lo or x > x_hi or y < y_lo or y > y_hi: continue
+            t = lifes[i]/totals[i]  # lebende Partikel: 0 < life <= total
+            s = max(1, int(sizes[i]*t))
+            ab = min(steps - 1, int(t*steps))
+            batch.append((sprites[colors[i]][s][ab], (x - camx - s//2, y - camy - s//2)))
+        surf.blits(batch, doreturn=False)
+
+# PARTICLE_SPRITES[color][size][alpha_step] -> Surface
+PARTICLE_SPRITES = []
+
+def build_particle_sprites():
+    PARTICLE_SPRITES.clear()
+    steps = PARTICLE_ALPHA_STEPS
+    for color in PARTICLE_COLORS:
+        by_size = [None]
+        for s in range(1, PARTICLE_MAX_SIZE + 1):
+            by_alpha = []
+            for ab in range(steps):
+                srf = pygame.Surface((s, s), pygame.SRCALPHA)
+                pygame.draw.circle(srf, (*color, 255*(ab+1)//steps), (s//2, s//2), s//2)
+                by_alpha.append(srf)
+            by_size.append(by_alpha)
+        PARTICLE_SPRITES.append(by_size)
+
+# Gegner-Sprites je Blickrichtung (alle Gegner haben dieselbe Größe)
+ENEMY_SPRITES = {}
 
 class Enemy:
     def __init__(self, x, y):
@@ -222,90 +465,83 @@ class Enemy:
         self.dir = random.choice([-1, 1])
         self.vy = 0.0
         self.on_ground = False
+        self._rect = pygame.Rect(0, 0, self.w, self.h)
 
-    @property
-    def rect(self):
-        return pygame.Rect(int(self.x - self.w/2), int(self.y - self.h), self.w, self.h)
+    def _sync_rect(self):
+        self._rect.update(int(self.x - self.w/2), int(self.y - self.h), self.w, self.h)
+        return self._rect
 
-    def _blocking(self, ch):
-        return solid(ch) or ch in ('|', 'F')
+    # geteiltes Rect-Objekt: zum Festhalten .copy() verwenden
+    rect = property(_sync_rect)
 
     def update(self, dt, tilemap):
+        _tile = TILE; _w = TILEMAP_W; _map_h = TILEMAP_H; _flags = TILE_FLAGS; _mask = ENEMY_BLOCK_MASK
         self.vy += GRAVITY * dt
-        self.vy = clamp(self.vy, -MAX_FALL, MAX_FALL)
+        if self.vy > MAX_FALL: self.vy = MAX_FALL  # nur Schwerkraft -> vy >= 0
 
+        # Horizontal: gleiche flache Integer-Suche wie _sweep_h/_sweep_v
         self.x += self.dir * ENEMY_SPEED * dt
-        r = self.rect
-        for tx, ty, ch in tiles_in_aabb(tilemap, r.inflate(0, -6)):
-            if not self._blocking(ch):
-                continue
-            tile_r = pygame.Rect(tx*TILE, ty*TILE, TILE, TILE)
-            if not r.colliderect(tile_r):
-                continue
-            if self.dir > 0:
-                self.x = tile_r.left - (self.w/2)
-            else:
-                self.x = tile_r.right + (self.w/2)
-            self.dir *= -1
-            r = self.rect
-
-        self.on_ground = False
-        total_dy = self.vy * dt
-        steps = max(1, int(abs(total_dy)//max(1, TILE//6)) + 1)
-        step_dy = total_dy / steps
-        for _ in range(steps):
-            prev_rect = self.rect.copy()
-            self.y += step_dy
-            r = self.rect
-            for tx, ty, ch in tiles_in_aabb(tilemap, r.inflate(-6, 0)):
-                if not self._blocking(ch):
+        w, h = self.w, self.h
+        left = int(self.x - w/2); top = int(self.y - h)
+        right = left + w; bottom = top + h
+        min_tx = max(0, left // _tile); max_tx = min(_w - 1, right // _tile)
+        min_ty = max(0, (top + 3) // _tile); max_ty = min(_map_h - 1, (bottom - 3) // _tile)
+        for ty in range(min_ty, max_ty + 1):
+            base = ty * _w
+            tt = ty * _tile
+            for tx in range(min_tx, max_tx + 1):
+                if not _flags[tilemap[base + tx]] & _mask:
                     continue
-                tile_r = pygame.Rect(tx*TILE, ty*TILE, TILE, TILE)
-                if not r.colliderect(tile_r):
+                tl = tx * _tile
+                if not (left < tl + _tile and tl < right and top < tt + _tile and tt < bottom):
                     continue
-                if step_dy > 0:
-                    if prev_rect.bottom <= tile_r.top and r.bottom >= tile_r.top:
-                        self.y = tile_r.top
-                        self.vy = 0
-                        self.on_ground = True
-                        r = self.rect
-                elif step_dy < 0:
-                    if prev_rect.top >= tile_r.bottom and r.top <= tile_r.bottom:
-                        self.y = tile_r.bottom + self.h
-                        self.vy = 0
-                        r = self.rect
+                if self.dir > 0:
+                    self.x = tl - w/2
+                else:
+                    self.x = tl + _tile + w/2
+                self.dir *= -1
+                left = int(self.x - w/2); right = left + w
+
+        self.y, self.vy, self.on_ground = _sweep_v(self.x, self.y, self.vy, self.w, self.h, dt,
+                                                   3, _mask, tilemap)
 
         if self.on_ground:
             ahead_x = self.x + self.dir * (self.w/2 + 6)
-            ahead_tx = int(ahead_x // TILE)
-            below_ty = int((self.y + 1) // TILE)
-            level_w = len(tilemap[0])
-            level_h = len(tilemap)
-            if (ahead_tx < 0 or ahead_tx >= level_w or below_ty >= level_h or
-                not self._blocking(tilemap[below_ty][ahead_tx])):
+            ahead_tx = int(ahead_x // _tile)
+            below_ty = int((self.y + 1) // _tile)
+            if (ahead_tx < 0 or ahead_tx >= _w or below_ty >= _map_h or
+                not _flags[tilemap[below_ty*_w + ahead_tx]] & _mask):
                 self.dir *= -1
 
     def stomp(self, particles):
         cx, cy = self.x, self.y - self.h/2
-        for _ in range(14):
-            ang = random.random() * math.tau
-            spd = random.uniform(80, 220)
-            particles.append(Particle(cx, cy, math.cos(ang)*spd, math.sin(ang)*spd-160, 0.45, COL_ENEMY, 5))
+        particles.spawn_burst(cx, cy, 14, 80, 220, 0.45, P_ENEMY, 5, vy_bias=-160)
+
+    def _sprite(self):
+        img = ENEMY_SPRITES.get(self.dir)
+        if img is None:
+            img = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
+            body_rect = pygame.Rect(0, self.h//4, self.w, self.h*3//4)
+            pygame.draw.ellipse(img, COL_ENEMY, body_rect)
+            brow_y = self.h//3
+            eye_offset = 8
+            eye_dir = self.dir
+            pygame.draw.circle(img, (30, 30, 45), (self.w//2 - eye_dir*eye_offset, brow_y), 5)
+            pygame.draw.circle(img, (255, 255, 255), (self.w//2 - eye_dir*eye_offset, brow_y), 5, 2)
+            foot_rect = pygame.Rect(6, self.h-10, self.w-12, 8)
+            pygame.draw.rect(img, (155, 95, 75), foot_rect, border_radius=6)
+            ENEMY_SPRITES[self.dir] = img
+        return img
 
     def draw(self, surf, camx, camy):
-        base = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
-        body_rect = pygame.Rect(0, self.h//4, self.w, self.h*3//4)
-        pygame.draw.ellipse(base, COL_ENEMY, body_rect)
-        brow_y = self.h//3
-        eye_offset = 8
-        eye_dir = self.dir
-        pygame.draw.circle(base, (30, 30, 45), (self.w//2 - eye_dir*eye_offset, brow_y), 5)
-        pygame.draw.circle(base, (255, 255, 255), (self.w//2 - eye_dir*eye_offset, brow_y), 5, 2)
-        foot_rect = pygame.Rect(6, self.h-10, self.w-12, 8)
-        pygame.draw.rect(base, (155, 95, 75), foot_rect, border_radius=6)
-        dest = base.get_rect()
-        dest.midbottom = (int(self.x - camx), int(self.y - camy))
-        surf.blit(base, dest)
+        surf.blit(self._sprite(), (int(self.x - camx) - self.w//2, int(self.y - camy) - self.h))
+
+# Trail-Geister je (w, h, alpha), statt pro Frame neue Surfaces
+TRAIL_GHOSTS = {}
+TRAIL_LEN = 12
+# Spieler-Sprites je (h, Farbe, Blickrichtung, Tilt-Stufe); Schlüsselraum ist endlich
+PLAYER_SPRITES = {}
+TILT_STEP_DEG = 2.0
 
 class Player:
     def __init__(self, x, y):
@@ -320,7 +556,11 @@ class Player:
         self.since_ground = 0.0
         self.jump_buf = 0.0
         self.facing = 1
-        self.trail = deque(maxlen=12)
+        # Dash-Trail als Ringpuffer (keine Tupel pro Eintrag)
+        self.trail_x = array('f', [0.0]*TRAIL_LEN)
+        self.trail_y = array('f', [0.0]*TRAIL_LEN)
+        self.trail_i = 0  # nächster Schreib-Slot
+        self.trail_n = 0  # belegte Slots
 
         # dash/sprint/crouch
         self.dash_t = 0.0
@@ -344,26 +584,47 @@ class Player:
         self.crouch_slide_dir = 0
 
         self.coins = 0
+        self._rect = pygame.Rect(0, 0, self.w, self.h)
+        self._stand_ok = None  # _can_stand-Ergebnis, gilt bis zur nächsten Bewegung
+
+    def _sync_rect(self):
+        self._rect.update(int(self.x - self.w/2), int(self.y - self.h), self.w, self.h)
+        return self._rect
 
-    @property
-    def rect(self):
-        return pygame.Rect(int(self.x - self.w/2), int(self.y - self.h), self.w, self.h)
+    # geteiltes Rect-Objekt: zum Festhalten .copy() verwenden
+    rect = property(_sync_rect)
 
-    def add_trail(self): self.trail.append((self.x, self.y, 0.7))
+    def add_trail(self):
+        i = self.trail_i
+        self.trail_x[i] = self.x; self.trail_y[i] = self.y
+        self.trail_i = (i + 1) % TRAIL_LEN
+        if self.trail_n < TRAIL_LEN: self.trail_n += 1
 
     def input_axis(self, keys):
-        left  = keys.get(pygame.K_a, False) or keys.get(pygame.K_LEFT, False)
-        right = keys.get(pygame.K_d, False) or keys.get(pygame.K_RIGHT, False)
-        ax = (-1.0 if left else 0.0) + (1.0 if right else 0.0)
+        ax = (-1.0 if keys.left else 0.0) + (1.0 if keys.right else 0.0)
         if ax != 0: self.facing = 1 if ax>0 else -1
         return ax
 
     def _can_stand(self, tilemap):
-        stand_rect = pygame.Rect(int(self.x - self.w/2), int(self.y - self.h_stand), self.w, self.h_stand)
-        for tx, ty, ch in tiles_in_aabb(tilemap, stand_rect.inflate(-8, -2)):
-            if ch in ('|','^','F') or solid(ch):
-                if stand_rect.colliderect(pygame.Rect(tx*TILE, ty*TILE, TILE, TILE)):
-                    return False
+        if self._stand_ok is None:
+            self._stand_ok = self._check_stand(tilemap)
+        return self._stand_ok
+
+    def _check_stand(self, tilemap):
+        _tile = TILE; _w = TILEMAP_W; _map_h = TILEMAP_H; _flags = TILE_FLAGS; _mask = BLOCK_MASK
+        pl = int(self.x - self.w/2); pt = int(self.y - self.h_stand)
+        pr = pl + self.w; pb = pt + self.h_stand
+        # Scan-Bereich wie inflate(-8, -2), Überlappung als Integer-Test ohne Rects
+        min_tx = max(0, (pl + 4) // _tile); max_tx = min(_w - 1, (pr - 4) // _tile)
+        min_ty = max(0, (pt + 1) // _tile); max_ty = min(_map_h - 1, (pb - 1) // _tile)
+        for ty in range(min_ty, max_ty + 1):
+            tt = ty * _tile
+            base = ty * _w
+            for tx in range(min_tx, max_tx + 1):
+                if _flags[tilemap[base + tx]] & _mask:
+                    tl = tx * _tile
+                    if pr > tl and pl < tl + _tile and pb > tt and pt < tt + _tile:
+                        return False
         return True
 
     def _set_crouch(self, want_crouch, tilemap):
@@ -392,11 +653,11 @@ class Player:
     def _spawn_skid_dust(self, particles, burst=False):
         if self.skid_dir == 0: return
         fx = self.x - self.skid_dir * 10; fy = self.y - 4
-        n = 8 if burst else 1
-        for _ in range(n):
-            vx = -self.skid_dir * random.uniform(120, 220 if burst else 160)
-            vy = -random.uniform(20, 140 if burst else 80)
-            particles.append(Particle(fx, fy, vx, vy, 0.35 if burst else 0.25, (210,215,230), 5))
+        d = -self.skid_dir
+        if burst:
+            particles.spawn_spray(fx, fy, 8, d*120, d*220, -20, -140, 0.35, P_DUST, 5)
+        else:
+            particles.spawn_spray(fx, fy, 1, d*120, d*160, -20, -80, 0.25, P_DUST, 5)
 
     def update(self, dt, keys, tilemap, particles, destroy_gate_cb):
         if self.since_ground < 10: self.since_ground += dt
@@ -406,12 +667,13 @@ class Player:
         if self.inv > 0: self.inv -= dt
         if self.skid_t > 0: self.skid_t -= dt
         if self.crouch_slide_t > 0: self.crouch_slide_t -= dt
+        self._stand_ok = None
 
         ax = self.input_axis(keys)
-        shift_held    = keys.get("shift_held", False)
-        shift_pressed = keys.get("dash_pressed", False)
-        crouch_held   = keys.get("crouch_held", False)
-        crouch_pressed= keys.get("crouch_pressed", False)
+        shift_held    = keys.shift_held
+        shift_pressed = keys.dash_pressed
+        crouch_held   = keys.crouch_held
+        crouch_pressed= keys.crouch_pressed
         input_dir = 1 if ax > 0 else (-1 if ax < 0 else 0)
         moving_dir = 1 if self.vx > 20 else (-1 if self.vx < -20 else 0)
 
@@ -434,10 +696,8 @@ class Player:
             self.crouch_slide_t = max(CROUCH_SLIDE_TIME_BASE, t_stop)   # genug Zeit, um die Strecke zu rollen
             self.crouch_slide_dir = 1 if self.vx >= 0 else -1
             # Staub zum Start
-            for _ in range(8):
-                vx = -self.crouch_slide_dir * random.uniform(80, 160)
-                vy = -random.uniform(20, 120)
-                particles.append(Particle(self.x, self.y-6, vx, vy, 0.3, (210,215,230), 5))
+            d = -self.crouch_slide_dir
+            particles.spawn_spray(self.x, self.y-6, 8, d*80, d*160, -20, -120, 0.3, P_DUST, 5)
 
         if self.crouch_slide_t > 0:
             self.h = self.h_crouch
@@ -487,9 +747,9 @@ class Player:
                 if abs(self.vx) <= dec: self.vx = 0
                 else: self.vx -= math.copysign(dec, self.vx)
                 if random.random() < 5.0*dt:
-                    particles.append(Particle(self.x, self.y-6,
-                                              -math.copysign(random.uniform(60,120), self.vx if self.vx!=0 else self.crouch_slide_dir),
-                                              -random.uniform(10,80), 0.25, (210,215,230), 4))
+                    particles.spawn(self.x, self.y-6,
+                                    -math.copysign(random.uniform(60,120), self.vx if self.vx!=0 else self.crouch_slide_dir),
+                                    -random.uniform(10,80), 0.25, P_DUST, 4)
             else:
                 # normale Eingabe
                 self.vx += accel * ax * dt
@@ -502,89 +762,106 @@ class Player:
         if self.dash_t <= 0:
             if self.sprint: max_speed *= SPRINT_SPEED_MULT
             if self.crouch and self.crouch_slide_t <= 0: max_speed *= CROUCH_SPEED_MULT
-            self.vx = clamp(self.vx, -max_speed, max_speed)
+            if self.vx > max_speed: self.vx = max_speed
+            elif self.vx < -max_speed: self.vx = -max_speed
 
         # --- Gravity & Jump ---
         self.vy += GRAVITY * dt
-        self.vy = clamp(self.vy, -9999, MAX_FALL)
-        if keys.get("jump_pressed", False): self.jump_buf = JUMP_BUFFER
-        if keys.get("jump_released", False) and self.vy < 0: self.vy *= JUMP_CUT
+        if self.vy > MAX_FALL: self.vy = MAX_FALL
+        if keys.jump_pressed: self.jump_buf = JUMP_BUFFER
+        if keys.jump_released and self.vy < 0: self.vy *= JUMP_CUT
 
         # --- Move & Collide ---
         self.on_ground = False
+        self._stand_ok = None
 
         # Horizontal
-        self.x += self.vx * dt
-        r = self.rect
-        collided_gate = None
-        for tx, ty, ch in tiles_in_aabb(tilemap, r.inflate(2, -2)):
-            tile_r = pygame.Rect(tx*TILE, ty*TILE, TILE, TILE)
-            if ch == '|':
-                if self.dash_t > 0:
-                    collided_gate = (tx, ty)
-                else:
-                    if r.colliderect(tile_r):
-                        if self.vx > 0: self.x = tile_r.left - (self.w/2)
-                        elif self.vx < 0: self.x = tile_r.right + (self.w/2)
-                        self.vx = 0
-            if solid(ch):
-                if r.colliderect(tile_r):
-                    if self.vx > 0: self.x = tile_r.left - (self.w/2)
-                    elif self.vx < 0: self.x = tile_r.right + (self.w/2)
-                    self.vx = 0
-
-        if collided_gate:
-            destroy_gate_cb(*collided_gate)
-            gx, gy = collided_gate
-            cx, cy = gx*TILE + TILE/2, gy*TILE + TILE/2
-            for _ in range(24):
-                ang = random.random()*math.tau
-                spd = random.uniform(200, 520)
-                particles.append(Particle(cx, cy, math.cos(ang)*spd, math.sin(ang)*spd-200, 0.5, (110,210,255), 5))
+        self.x, self.vx, gate_tx, gate_ty = _sweep_h(self.x, self.y, self.vx, self.w, self.h, dt,
+                                                     self.dash_t > 0, tilemap)
+        if gate_tx >= 0:
+            destroy_gate_cb(gate_tx, gate_ty)
+            cx, cy = gate_tx*TILE + TILE/2, gate_ty*TILE + TILE/2
+            particles.spawn_burst(cx, cy, 24, 200, 520, 0.5, P_GATE, 5, vy_bias=-200)
 
         # Vertikal (sub-steps)
-        total_dy = self.vy * dt
-        steps = max(1, int(abs(total_dy)//max(1, TILE//6)) + 1)
-        step_dy = total_dy / steps
-        for _ in range(steps):
-            prev_rect = self.rect.copy()
-            self.y += step_dy
-            r = self.rect
-            for tx, ty, ch in tiles_in_aabb(tilemap, r.inflate(-8, 0)):
-                if ch == '|' and self.dash_t > 0: continue
-                if ch == '|' or solid(ch):
-                    tile_r = pygame.Rect(tx*TILE, ty*TILE, TILE, TILE)
-                    if not r.colliderect(tile_r): continue
-                    if step_dy > 0:
-                        if prev_rect.bottom <= tile_r.top and r.bottom >= tile_r.top:
-                            self.y = tile_r.top; self.vy = 0; self.on_ground = True; self.since_ground = 0.0; r = self.rect
-                    elif step_dy < 0:
-                        if prev_rect.top >= tile_r.bottom and r.top <= tile_r.bottom:
-                            self.y = tile_r.bottom + self.h; self.vy = 0; r = self.rect
+        blocking = SOLID_BIT if self.dash_t > 0 else MOVE_BLOCK_MASK
+        self.y, self.vy, landed = _sweep_v(self.x, self.y, self.vy, self.w, self.h, dt, 4, blocking, tilemap)
+        if landed:
+            self.on_ground = True; self.since_ground = 0.0
 
         # visueller Tilt
         tilt_target = (-SKID_TILT_DEG * self.skid_dir) if self.skid_t > 0 else 0.0
         self.visual_tilt += (tilt_target - self.visual_tilt) * min(1.0, 14*dt)
 
-    def draw(self, surf, camx, camy):
-        for i, (tx, ty, alpha) in enumerate(self.trail):
-            t = (i+1)/len(self.trail); a = int(180*t)
+    def _trail_ghost(self, alpha):
+        key = (self.w, self.h, alpha)
+        srf = TRAIL_GHOSTS.get(key)
+        if srf is None:
             srf = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
-            pygame.draw.rect(srf, (255,255,255,a//3), (0,0,self.w,self.h), border_radius=10)
-            surf.blit(srf, (tx - self.w/2 - camx, ty - self.h - camy))
+            pygame.draw.rect(srf, (255,255,255,alpha), (0,0,self.w,self.h), border_radius=10)
+            TRAIL_GHOSTS[key] = srf
+        return srf
+
+    def _sprite(self, color, tilt_step):
+        key = (self.h, color, self.facing > 0, tilt_step)
+        img = PLAYER_SPRITES.get(key)
+        if img is None:
+            if tilt_step:
+                img = pygame.transform.rotate(self._sprite(color, 0), tilt_step * TILT_STEP_DEG)
+            else:
+                img = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
+                pygame.draw.rect(img, color, (0,0,self.w,self.h), border_radius=10)
+                eye_x = self.w//2 + (8 * (1 if self.facing>0 else -1))
+                eye_y = 12 if self.h == H_CROUCH else 14
+                pygame.draw.circle(img, (40,40,60), (eye_x, eye_y), 4)
+            PLAYER_SPRITES[key] = img
+        return img
+
+    def draw(self, surf, camx, camy):
+        n = self.trail_n
+        if n:
+            # vom ältesten zum neuesten Eintrag, Alpha steigt
+            start = self.trail_i - n
+            ox = self.w/2 + camx; oy = self.h + camy
+            tx, ty = self.trail_x, self.trail_y
+            surf.blits([(self._trail_ghost(int(180*(k+1)/n)//3), (tx[(start+k) % TRAIL_LEN] - ox, ty[(start+k) % TRAIL_LEN] - oy))
+                        for k in range(n)], doreturn=False)
 
         color = (255, 215, 80) if self.sprint and self.dash_t<=0 else COL_PLAYER
         foot_x = self.x - camx; foot_y = self.y - camy
-        base = pygame.Surface((self.w, self.h), pygame.SRCALPHA)
-        pygame.draw.rect(base, color, (0,0,self.w,self.h), border_radius=10)
-        eye_x = self.w//2 + (8 * (1 if self.facing>0 else -1))
-        eye_y = 12 if self.h == H_CROUCH else 14
-        pygame.draw.circle(base, (40,40,60), (eye_x, eye_y), 4)
-        img = pygame.transform.rotate(base, self.visual_tilt) if abs(self.visual_tilt) > 0.5 else base
+        img = self._sprite(color, round(self.visual_tilt / TILT_STEP_DEG))
         dest = img.get_rect(); dest.midbottom = (int(foot_x), int(foot_y))
         surf.blit(img, dest)
 
 # ---------------- Game ----------------
+def draw_tile(surf, ch, x, y):
+    if TILE_FLAGS[ch] & SOLID_BIT:
+        r = pygame.Rect(x, y, TILE, TILE)
+        pygame.draw.rect(surf, COL_SOLID, r, border_radius=6)
+        top = r.copy(); top.h = max(6, r.h//5)
+        pygame.draw.rect(surf, COL_SOLID_TOP, top, border_radius=6)
+    elif ch == CH_SPIKE:
+        pts = [(x, y+TILE), (x+TILE/2, y), (x+TILE, y+TILE)]
+        pygame.draw.polygon(surf, COL_SPIKE, pts)
+    elif ch == CH_C:
+        pygame.draw.circle(surf, COL_COIN, (x+TILE//2, y+TILE//2), 12)
+        pygame.draw.circle(surf, (255,240,140), (x+TILE//2, y+TILE//2), 12, 2)
+    elif ch == CH_PIPE:
+        pygame.draw.rect(surf, COL_GATE, (x+10, y, TILE-20, TILE))
+        pygame.draw.rect(surf, (255,255,255), (x+10, y, TILE-20, TILE), 2)
+    elif ch == CH_D:
+        glow = pygame.Surface((TILE, TILE), pygame.SRCALPHA)
+        pygame.draw.circle(glow, (130,255,220,120), (TILE//2, TILE//2), 18)
+        pygame.draw.circle(glow, (130,255,220,80), (TILE//2, TILE//2), 28)
+        surf.blit(glow, (x, y))
+        pts = [(x+TILE//2, y+12), (x+TILE-12, y+TILE//2), (x+TILE//2, y+TILE-12), (x+12, y+TILE//2)]
+        pygame.draw.polygon(surf, COL_DASHITEM, pts)
+        pygame.draw.polygon(surf, (255,255,255), pts, 2)
+    elif ch == CH_F:
+        pole = pygame.Rect(x+TILE//2-2, y, 4, TILE*4)
+        pygame.draw.rect(surf, (220,220,230), pole)
+        pygame.draw.polygon(surf, COL_FLAG, [(pole.right, y+10), (pole.right+26, y+22), (pole.right, y+34)])
+
 class Game:
     def __init__(self):
         pygame.init()
@@ -594,28 +871,46 @@ class Game:
         self.font = pygame.font.Font(None, 32)
         self.font_big = pygame.font.Font(None, 56)
         self.font_small = pygame.font.Font(None, 24)
+        build_particle_sprites()
+        self._text_cache = {}
+        self._shade_cache = {}
+        self.tile_patches = {}   # Index -> Hintergrund unter einem veränderlichen Tile
+        self.cleared_tiles = []  # seit reset() gelöschte Tiles, werden dort neu gemalt
+        self.level_surf = self.render_level()
+        self._view = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        # Tastenstand des Vorframes für Flanken; bleibt über reset() erhalten
+        self._jp_last = self._sh_last = self._cr_last = False
         self.reset()
 
     def reset(self):
-        self.tilemap = [list(row) for row in LEVEL]
+        self.tilemap = bytearray(LEVEL_BYTES)
+        for i in self.cleared_tiles:
+            ty, tx = divmod(i, TILEMAP_W)
+            self.level_surf.blit(self.tile_patches[i], (tx*TILE, ty*TILE))
+            draw_tile(self.level_surf, LEVEL_BYTES[i], tx*TILE, ty*TILE)
+        self.cleared_tiles.clear()
         self.enemies = []
-        for ty, row in enumerate(self.tilemap):
-            for tx, ch in enumerate(row):
-                if ch == 'G':
-                    foot_y = (ty + 1) * TILE
-                    self.enemies.append(Enemy(tx*TILE + TILE//2, foot_y))
-                    self.tilemap[ty][tx] = ' '
+        i = self.tilemap.find(CH_G)
+        while i >= 0:
+            ty, tx = divmod(i, TILEMAP_W)
+            foot_y = (ty + 1) * TILE
+            self.enemies.append(Enemy(tx*TILE + TILE//2, foot_y))
+            self.tilemap[i] = CH_SPACE
+            i = self.tilemap.find(CH_G, i + 1)
         start_x = 3*TILE + TILE//2
-        ground_y = (len(self.tilemap)-1)*TILE
+        ground_y = (TILEMAP_H-1)*TILE
         self.player = Player(start_x, ground_y)
-        self.coins_total = sum(row.count('C') for row in self.tilemap)
+        self.coins_total = self.tilemap.count(CH_C)
         self.coins_got = 0
         self.time = 0.0
         self.state = "RUN"
         self.camera_x = 0.0
         self.camera_y = 0.0
-        self.particles = []
+        self.particles = ParticleSystem()
+        self.enemy_grid = SpatialHashGrid()
         self.best_time = load_save().get("best_time")
+        self.end_saved = False
+        self.end_drawn = False
         self.toast = ""
         self.toast_t = 0.0
 
@@ -630,194 +925,238 @@ class Game:
             (TILE*140, TILE*6, TILE*168, TILE*12, "Sprint + Sprung: weiter & höher!", "unlocked"),
         ]
 
+    def clear_tile(self, i):
+        # Tile leeren und nur seine Zelle in level_surf mit dem gesicherten Hintergrund übermalen
+        self.tilemap[i] = CH_SPACE
+        ty, tx = divmod(i, TILEMAP_W)
+        self.level_surf.blit(self.tile_patches[i], (tx*TILE, ty*TILE))
+        self.cleared_tiles.append(i)
+
     def destroy_gate(self, tx, ty):
-        if self.tilemap[ty][tx] == '|':
-            self.tilemap[ty][tx] = ' '
+        i = ty*TILEMAP_W + tx
+        if self.tilemap[i] == CH_PIPE:
+            self.clear_tile(i)
 
     def camera_follow(self, dt):
         target_x = self.player.x - WIDTH*0.4
-        level_w = len(self.tilemap[0]) * TILE
-        target_x = clamp(target_x, 0, max(0, level_w - WIDTH))
+        target_x = clamp(target_x, 0, max(0, LEVEL_PX_W - WIDTH))
         self.camera_x += (target_x - self.camera_x) * min(1.0, 10*dt)
         self.camera_y = 0
 
     def update(self, dt):
         if self.state != "RUN": return
+        player = self.player; tilemap = self.tilemap; particles = self.particles
 
-        level_h = len(self.tilemap) * TILE
+        level_h = LEVEL_PX_H
         keys_raw = pygame.key.get_pressed()
         jp = keys_raw[pygame.K_SPACE]
         sh = keys_raw[pygame.K_LSHIFT]
         cr = keys_raw[pygame.K_s] or keys_raw[pygame.K_DOWN]
 
-        keys = {
-            pygame.K_a: keys_raw[pygame.K_a],
-            pygame.K_d: keys_raw[pygame.K_d],
-            pygame.K_LEFT: keys_raw[pygame.K_LEFT],
-            pygame.K_RIGHT: keys_raw[pygame.K_RIGHT],
-            "shift_held": sh,
-            "dash_pressed": sh and not getattr(self, "_sh_last", False),
-            "jump_pressed": jp and not getattr(self, "_jp_last", False),
-            "jump_released": (not jp) and getattr(self, "_jp_last", False),
-            "crouch_held": cr,
-            "crouch_pressed": cr and not getattr(self, "_cr_last", False),
-        }
+        jp_last = self._jp_last
+        keys = InputState(
+            keys_raw[pygame.K_a] or keys_raw[pygame.K_LEFT],
+            keys_raw[pygame.K_d] or keys_raw[pygame.K_RIGHT],
+            sh,
+            sh and not self._sh_last,
+            jp and not jp_last,
+            (not jp) and jp_last,
+            cr,
+            cr and not self._cr_last,
+        )
         self._jp_last = jp; self._sh_last = sh; self._cr_last = cr
 
-        prev_rect = self.player.rect.copy()
-        prev_vy = self.player.vy
-        self.player.update(dt, keys, self.tilemap, self.particles, self.destroy_gate)
-        if keys["jump_pressed"]: self.player.try_jump()
-
-        for enemy in list(self.enemies):
-            enemy.update(dt, self.tilemap)
-            if enemy.y > level_h + 200:
-                self.enemies.remove(enemy)
-
-        r = self.player.rect
-        for tx, ty, ch in tiles_in_aabb(self.tilemap, r.inflate(8,8)):
-            if ch == 'C':
-                self.tilemap[ty][tx] = ' '; self.coins_got += 1
+        prev_bottom = player.rect.bottom   # mehr braucht der Stomp-Test vom Vorframe nicht
+        prev_vy = player.vy
+        player.update(dt, keys, tilemap, particles, self.destroy_gate)
+        if keys.jump_pressed: player.try_jump()
+
+        # Gegner weit außerhalb des Bildes pausieren (aktives Fenster: eine Bildbreite links/rechts)
+        xmin = self.camera_x - WIDTH
+        xmax = self.camera_x + 2*WIDTH
+        enemies = self.enemies
+        w = 0
+        for enemy in enemies:
+            if xmin <= enemy.x <= xmax:
+                enemy.update(dt, tilemap)
+                if enemy.y > level_h + 200: continue
+            enemies[w] = enemy; w += 1
+        del enemies[w:]
+        # Broadphase nur für Gegner im Kamerafenster (+2 Zellen); nur dort kann der Spieler sie treffen
+        grid = self.enemy_grid
+        grid.clear()
+        xmin = self.camera_x - 2*grid.cell
+        xmax = self.camera_x + WIDTH + 2*grid.cell
+        for enemy in enemies:
+            if xmin <= enemy.x <= xmax:
+                grid.insert(enemy.rect, enemy)
+
+        r = player.rect
+        pl, pr, pt, pb = r.left, r.right, r.top, r.bottom
+        # Suchfenster wie r.inflate(8, 8)
+        min_tx = max(0, (pl - 4)//TILE); max_tx = min(TILEMAP_W-1, (pr + 4)//TILE)
+        min_ty = max(0, (pt - 4)//TILE); max_ty = min(TILEMAP_H-1, (pb + 4)//TILE)
+        touch = TOUCH_KEYS
+        lo = bisect_left(touch, min_tx*TILEMAP_H + min_ty)
+        hi = bisect_right(touch, max_tx*TILEMAP_H + max_ty)
+        for j in range(lo, hi):
+            tx, ty = divmod(touch[j], TILEMAP_H)
+            if ty < min_ty or ty > max_ty: continue
+            i = ty*TILEMAP_W + tx
+            ch = tilemap[i]
+            if ch == CH_C:
+                self.clear_tile(i); self.coins_got += 1
                 cx, cy = tx*TILE + TILE/2, ty*TILE + TILE/2
-                for _ in range(10):
-                    ang = random.random()*math.tau; spd = random.uniform(120, 360)
-                    self.particles.append(Particle(cx, cy, math.cos(ang)*spd, math.sin(ang)*spd-120, 0.4, (255,225,90), 5))
-            elif ch == 'D':
-                self.tilemap[ty][tx] = ' '; self.player.dash_unlocked = True
+                particles.spawn_burst(cx, cy, 10, 120, 360, 0.4, P_COIN, 5, vy_bias=-120)
+            elif ch == CH_D:
+                self.clear_tile(i); player.dash_unlocked = True
                 cx, cy = tx*TILE + TILE/2, ty*TILE + TILE/2
-                for _ in range(26):
-                    ang = random.random()*math.tau; spd = random.uniform(180, 480)
-                    self.particles.append(Particle(cx, cy, math.cos(ang)*spd, math.sin(ang)*spd-160, 0.6, COL_DASHITEM, 6))
+                particles.spawn_burst(cx, cy, 26, 180, 480, 0.6, P_DASH, 6, vy_bias=-160)
                 self.toast = "Dash freigeschaltet!  Left-Shift tippen: Dash  •  Halten: Sprint"; self.toast_t = 4.0
-            elif ch == '^':
-                if self.player.inv <= 0 and r.colliderect(pygame.Rect(tx*TILE, ty*TILE, TILE, TILE)):
+            elif ch == CH_SPIKE:
+                tl = tx*TILE; tt = ty*TILE
+                if player.inv <= 0 and pr > tl and pl < tl+TILE and pb > tt and pt < tt+TILE:
                     self.state = "DEAD"
-            elif ch == 'F':
-                if r.colliderect(pygame.Rect(tx*TILE, ty*TILE, TILE, TILE)):
+            elif ch == CH_F:
+                tl = tx*TILE; tt = ty*TILE
+                if pr > tl and pl < tl+TILE and pb > tt and pt < tt+TILE:
                     self.state = "WIN"; break
 
-        r = self.player.rect
-        for enemy in list(self.enemies):
-            if not r.colliderect(enemy.rect):
+        for enemy in grid.query(r.inflate(8, 8)):
+            er = enemy.rect
+            if not r.colliderect(er):
                 continue
-            stomp = ((prev_vy >= 0 and prev_rect.bottom <= enemy.rect.top + 6 and
-                      r.bottom >= enemy.rect.top) or self.player.dash_t > 0)
+            stomp = ((prev_vy >= 0 and prev_bottom <= er.top + 6 and
+                      r.bottom >= er.top) or player.dash_t > 0)
             if stomp:
-                self.player.y = enemy.rect.top
-                self.player.vy = JUMP_VEL * 0.6
-                self.player.on_ground = False
-                self.player.since_ground = 999
-                enemy.stomp(self.particles)
-                self.enemies.remove(enemy)
-                r = self.player.rect
+                player.y = er.top
+                player.vy = JUMP_VEL * 0.6
+                player.on_ground = False
+                player.since_ground = 999
+                enemy.stomp(particles)
+                enemies.remove(enemy)
+                player._sync_rect()   # r ist dasselbe Objekt, nur neu ausrichten
                 continue
-            if self.player.inv <= 0:
+            if player.inv <= 0:
                 self.state = "DEAD"
                 break
 
-        self.particles = [p for p in self.particles if p.update(dt)]
+        particles.update(dt, self.camera_y)
 
         if self.toast_t > 0:
             self.toast_t -= dt
             if self.toast_t <= 0: self.toast_t = 0; self.toast = ""
 
-        if self.player.y > level_h + 200: self.state = "DEAD"
+        if player.y > level_h + 200: self.state = "DEAD"
 
         self.camera_follow(dt)
         self.time += dt
 
+    def render_level(self):
+        # Hintergrund + alle Tiles einmal in Levelgröße rendern. Unter veränderlichen Tiles
+        # (Coins, Gates, Dash-Kern) wird vorher der Hintergrund gesichert, siehe clear_tile().
+        level_w, level_h = LEVEL_PX_W, LEVEL_PX_H
+        surf = pygame.Surface((level_w, level_h)).convert()
+        surf.fill(COL_BG1)
+        pygame.draw.rect(surf, COL_BG2, (0, HEIGHT*0.55, level_w, HEIGHT*0.45))
+        for i, ch in enumerate(LEVEL_BYTES):
+            if TILE_FLAGS[ch] & STATIC_MASK:
+                ty, tx = divmod(i, TILEMAP_W)
+                draw_tile(surf, ch, tx*TILE, ty*TILE)
+        for i, ch in enumerate(LEVEL_BYTES):
+            if TILE_FLAGS[ch] & DYNAMIC_MASK:
+                ty, tx = divmod(i, TILEMAP_W)
+                self.tile_patches[i] = surf.subsurface((tx*TILE, ty*TILE, TILE, TILE)).copy()
+                draw_tile(surf, ch, tx*TILE, ty*TILE)
+        return surf
+
     def draw_bg(self):
-        self.screen.fill(COL_BG1)
-        pygame.draw.rect(self.screen, COL_BG2, (0, HEIGHT*0.55, WIDTH, HEIGHT*0.45))
+        camx, camy = int(self.camera_x), int(self.camera_y)
+        view = self._view; view.topleft = (camx, camy)
+        self.screen.blit(self.level_surf, (0, 0), view)
 
     def draw_world(self):
+        # alle Tiles liegen in level_surf (draw_bg); hier nur noch die Objekte
         camx, camy = int(self.camera_x), int(self.camera_y)
-        min_tx = max(0, camx // TILE - 1)
-        max_tx = min(len(self.tilemap[0])-1, (camx + WIDTH)//TILE + 1)
-        min_ty = 0; max_ty = len(self.tilemap)-1
-
-        for ty in range(min_ty, max_ty+1):
-            for tx in range(min_tx, max_tx+1):
-                ch = self.tilemap[ty][tx]
-                if ch == ' ': continue
-                x, y = tx*TILE - camx, ty*TILE - camy
-                if ch in ('X','='):
-                    r = pygame.Rect(x, y, TILE, TILE)
-                    pygame.draw.rect(self.screen, COL_SOLID, r, border_radius=6)
-                    top = r.copy(); top.h = max(6, r.h//5)
-                    pygame.draw.rect(self.screen, COL_SOLID_TOP, top, border_radius=6)
-                elif ch == '^':
-                    pts = [(x, y+TILE), (x+TILE/2, y), (x+TILE, y+TILE)]
-                    pygame.draw.polygon(self.screen, COL_SPIKE, pts)
-                elif ch == 'C':
-                    pygame.draw.circle(self.screen, COL_COIN, (x+TILE//2, y+TILE//2), 12)
-                    pygame.draw.circle(self.screen, (255,240,140), (x+TILE//2, y+TILE//2), 12, 2)
-                elif ch == '|':
-                    pygame.draw.rect(self.screen, COL_GATE, (x+10, y, TILE-20, TILE))
-                    pygame.draw.rect(self.screen, (255,255,255), (x+10, y, TILE-20, TILE), 2)
-                elif ch == 'D':
-                    glow = pygame.Surface((TILE, TILE), pygame.SRCALPHA)
-                    pygame.draw.circle(glow, (130,255,220,120), (TILE//2, TILE//2), 18)
-                    pygame.draw.circle(glow, (130,255,220,80), (TILE//2, TILE//2), 28)
-                    self.screen.blit(glow, (x, y))
-                    pts = [(x+TILE//2, y+12), (x+TILE-12, y+TILE//2), (x+TILE//2, y+TILE-12), (x+12, y+TILE//2)]
-                    pygame.draw.polygon(self.screen, COL_DASHITEM, pts)
-                    pygame.draw.polygon(self.screen, (255,255,255), pts, 2)
-                elif ch == 'F':
-                    pole = pygame.Rect(x+TILE//2-2, y, 4, TILE*4)
-                    pygame.draw.rect(self.screen, (220,220,230), pole)
-                    pygame.draw.polygon(self.screen, COL_FLAG, [(pole.right, y+10), (pole.right+26, y+22), (pole.right, y+34)])
-
+        screen = self.screen
         for enemy in self.enemies:
-            enemy.draw(self.screen, camx, camy)
-        for p in self.particles: p.draw(self.screen, camx, camy)
-        self.player.draw(self.screen, camx, camy)
+            enemy.draw(screen, camx, camy)
+        self.particles.draw(screen, camx, camy)
+        self.player.draw(screen, camx, camy)
+
+    def _text(self, font, s, col):
+        # font.render nur bei neuem Text; älteste Einträge fliegen bei vollem Cache raus
+        cache = self._text_cache
+        key = (id(font), s, col)
+        img = cache.get(key)
+        if img is None:
+            if len(cache) >= TEXT_CACHE_CAP:
+                del cache[next(iter(cache))]
+            img = cache[key] = font.render(s, True, col)
+        return img
+
+    def _shade(self, size, rgba, radius=0):
+        # halbtransparente Hintergrund-Panels; wenige feste Größen -> einmal bauen
+        key = (size, rgba, radius)
+        srf = self._shade_cache.get(key)
+        if srf is None:
+            srf = pygame.Surface(size, pygame.SRCALPHA)
+            if radius:
+                pygame.draw.rect(srf, rgba, srf.get_rect(), border_radius=radius)
+            else:
+                srf.fill(rgba)
+            self._shade_cache[key] = srf
+        return srf
 
     def draw_ui(self):
-        timg = self.font.render(f"Zeit: {self.time:0.2f}s", True, COL_TEXT); self.screen.blit(timg, (16, 12))
-        cimg = self.font.render(f"Coins: {self.coins_got}/{self.coins_total}", True, COL_TEXT); self.screen.blit(cimg, (16, 44))
-        sprint = "an" if (self.player.sprint and self.player.dash_t<=0) else "aus"
-        crouch = "an" if self.player.crouch else "aus"
-        s_dash = "freigeschaltet" if self.player.dash_unlocked else "gesperrt"
-        simg = self.font_small.render(f"Dash: {s_dash}   |   Sprint: {sprint}   |   Ducken: {crouch}", True, COL_DIM)
-        self.screen.blit(simg, (16, 72))
-        best = load_save().get("best_time")
+        screen = self.screen; player = self.player
+        timg = self._text(self.font, f"Zeit: {self.time:0.1f}s", COL_TEXT); screen.blit(timg, (16, 12))
+        cimg = self._text(self.font, f"Coins: {self.coins_got}/{self.coins_total}", COL_TEXT); screen.blit(cimg, (16, 44))
+        sprint = "an" if (player.sprint and player.dash_t<=0) else "aus"
+        crouch = "an" if player.crouch else "aus"
+        s_dash = "freigeschaltet" if player.dash_unlocked else "gesperrt"
+        simg = self._text(self.font_small, f"Dash: {s_dash}   |   Sprint: {sprint}   |   Ducken: {crouch}", COL_DIM)
+        screen.blit(simg, (16, 72))
+        best = self.best_time
         if best is not None:
-            bimg = self.font_small.render(f"Bestzeit: {best:0.2f}s", True, COL_DIM)
-            self.screen.blit(bimg, (16, 96))
+            bimg = self._text(self.font_small, f"Bestzeit: {best:0.2f}s", COL_DIM)
+            screen.blit(bimg, (16, 96))
 
-        pr = self.player.rect
+        r = player.rect
+        pl, pr, pt, pb = r.left, r.right, r.top, r.bottom
+        skip = "locked" if player.dash_unlocked else "unlocked"
         for x1,y1,x2,y2,text,cond in self.hints:
-            if cond == "locked" and self.player.dash_unlocked: continue
-            if cond == "unlocked" and not self.player.dash_unlocked: continue
-            if pr.colliderect(pygame.Rect(x1,y1,x2-x1,y2-y1)):
-                tip = self.font_small.render(text, True, (220,230,255))
+            if cond == skip: continue
+            if pr > x1 and pl < x2 and pb > y1 and pt < y2:
+                tip = self._text(self.font_small, text, (220,230,255))
                 bg = tip.get_rect(); bg.topleft = (16, HEIGHT-48); bg.inflate_ip(16, 10)
-                shade = pygame.Surface(bg.size, pygame.SRCALPHA)
-                pygame.draw.rect(shade, (20,26,40,180), shade.get_rect(), border_radius=8)
-                self.screen.blit(shade, bg); self.screen.blit(tip, (bg.x+8, bg.y+4))
+                shade = self._shade(bg.size, (20,26,40,180), 8)
+                screen.blit(shade, bg); screen.blit(tip, (bg.x+8, bg.y+4))
                 break
 
         if hasattr(self, "toast_t") and self.toast_t > 0 and self.toast:
-            tip = self.font.render(self.toast, True, (255,255,255))
+            tip = self._text(self.font, self.toast, (255,255,255))
             bg = tip.get_rect(center=(WIDTH//2, 36)); bg.inflate_ip(24, 14)
-            shade = pygame.Surface(bg.size, pygame.SRCALPHA)
-            pygame.draw.rect(shade, (20,26,40,200), shade.get_rect(), border_radius=10)
-            self.screen.blit(shade, bg); self.screen.blit(tip, tip.get_rect(center=bg.center))
+            shade = self._shade(bg.size, (20,26,40,200), 10)
+            screen.blit(shade, bg); screen.blit(tip, tip.get_rect(center=bg.center))
 
     def draw_end(self, win=True):
         msg = "LEVEL GESCHAFFT!" if win else "UPS! VERSUCH'S NOCHMAL"
         sub = "SPACE: Neustart   ESC: Beenden"
-        best_time = load_save().get("best_time")
-        if win and (best_time is None or self.time < best_time):
-            data = load_save(); data["best_time"] = self.time; save_save(data)
-        shade = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA); shade.fill((0,0,0,140))
-        self.screen.blit(shade, (0,0))
-        t = self.font_big.render(msg, True, (255, 240, 180) if win else (255, 190, 190))
+        if win and not self.end_saved:
+            # Bestzeit nur einmal beim Wechsel auf den Endbildschirm speichern
+            self.end_saved = True
+            data = load_save()
+            best_time = data.get("best_time")
+            if best_time is None or self.time < best_time:
+                data["best_time"] = self.time; save_save(data)
+                self.best_time = self.time
+        self.screen.blit(self._shade((WIDTH, HEIGHT), (0,0,0,140)), (0,0))
+        t = self._text(self.font_big, msg, (255, 240, 180) if win else (255, 190, 190))
         self.screen.blit(t, t.get_rect(center=(WIDTH//2, HEIGHT//2 - 40)))
-        s = self.font.render(f"Zeit: {self.time:0.2f}s", True, COL_TEXT)
+        s = self._text(self.font, f"Zeit: {self.time:0.2f}s", COL_TEXT)
         self.screen.blit(s, s.get_rect(center=(WIDTH//2, HEIGHT//2 + 10)))
-        s2 = self.font_small.render(sub, True, COL_DIM)
+        s2 = self._text(self.font_small, sub, COL_DIM)
         self.screen.blit(s2, s2.get_rect(center=(WIDTH//2, HEIGHT//2 + 48)))
 
     def run(self):
@@ -825,15 +1164,17 @@ class Game:
             dt = self.clock.tick(FPS)/1000.0
             for e in pygame.event.get():
                 if e.type == pygame.QUIT: pygame.quit(); raise SystemExit
+                if e.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED): self.end_drawn = False
                 if e.type == pygame.KEYDOWN:
                     if e.key == pygame.K_ESCAPE: pygame.quit(); raise SystemExit
                     if e.key == pygame.K_SPACE and self.state in ("DEAD","WIN"): self.reset()
 
             if self.state == "RUN": self.update(dt)
+            elif self.end_drawn: continue   # Endbildschirm ist statisch: nicht neu zeichnen
 
             self.draw_bg(); self.draw_world(); self.draw_ui()
-            if self.state == "DEAD": self.draw_end(win=False)
-            elif self.state == "WIN": self.draw_end(win=True)
+            if self.state == "DEAD": self.draw_end(win=False); self.end_drawn = True
+            elif self.state == "WIN": self.draw_end(win=True); self.end_drawn = True
             pygame.display.flip()
 
 # ------------- main -------------